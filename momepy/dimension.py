@@ -12,6 +12,7 @@ import scipy as sp
 from shapely.geometry import LineString, Point, Polygon
 from tqdm import tqdm
 
+from .intensity import _neighbours_csr, _reduce_neighbours
 from .shape import _make_circle
 
 __all__ = [
@@ -538,13 +539,11 @@ class StreetProfile:
         heights_deviations_list = []
         openness_list = []
 
-        for idx, row in tqdm(left.iterrows(), total=left.shape[0]):
+        for shapely_line in tqdm(left.geometry, total=left.shape[0]):
             # list to hold all the point coords
             list_points = []
             # set the current distance to place the point
             current_dist = distance
-            # make shapely MultiLineString object
-            shapely_line = row.geometry
             # get the total length of the line
             line_length = shapely_line.length
             # append the starting coordinate to the list
@@ -648,8 +647,8 @@ class StreetProfile:
                                 )
                         if heights is not None:
                             indices = {}
-                            for idx, row in get_height.iterrows():
-                                dist = row.geometry.distance(Point(tick.coords[-1]))
+                            for idx, geom in get_height.geometry.iteritems():
+                                dist = geom.distance(Point(tick.coords[-1]))
                                 indices[idx] = dist
                             minim = min(indices, key=indices.get)
                             m_heights.append(right.loc[minim][heights])
@@ -781,23 +780,17 @@ class WeightedCharacter:
 
         data = data.set_index(unique_id)[[values, areas]]
 
-        results_list = []
-        for index in tqdm(data.index, total=data.shape[0]):
-            if index in spatial_weights.neighbors.keys():
-                neighbours = spatial_weights.neighbors[index].copy()
-                if neighbours:
-                    neighbours.append(index)
-                else:
-                    neighbours = [index]
+        position = {uid: i for i, uid in enumerate(data.index)}
+        indptr, indices, in_sw = _neighbours_csr(data.index, spatial_weights, position)
+        weighted = _reduce_neighbours(
+            indptr, indices, (data[values] * data[areas]).values, "sum"
+        )
+        total = _reduce_neighbours(indptr, indices, data[areas].values, "sum")
 
-                subset = data.loc[neighbours]
-                results_list.append(
-                    (sum(subset[values] * subset[areas])) / (sum(subset[areas]))
-                )
-            else:
-                results_list.append(np.nan)
+        results = np.full(len(data), np.nan)
+        results[in_sw] = weighted[in_sw] / total[in_sw]
 
-        self.series = pd.Series(results_list, index=gdf.index)
+        self.series = pd.Series(results, index=gdf.index)
 
 
 class CoveredArea:
@@ -845,21 +838,14 @@ class CoveredArea:
         data = gdf
         area = data.set_index(unique_id).geometry.area
 
-        results_list = []
-        for index in tqdm(area.index, total=area.shape[0]):
-            if index in spatial_weights.neighbors.keys():
-                neighbours = spatial_weights.neighbors[index].copy()
-                if neighbours:
-                    neighbours.append(index)
-                else:
-                    neighbours = [index]
+        position = {uid: i for i, uid in enumerate(area.index)}
+        indptr, indices, in_sw = _neighbours_csr(area.index, spatial_weights, position)
+        covered = _reduce_neighbours(indptr, indices, area.values, "sum")
 
-                areas = area.loc[neighbours]
-                results_list.append(sum(areas))
-            else:
-                results_list.append(np.nan)
+        results = np.full(len(area), np.nan)
+        results[in_sw] = covered[in_sw]
 
-        self.series = pd.Series(results_list, index=gdf.index)
+        self.series = pd.Series(results, index=gdf.index)
 
 
 class PerimeterWall:
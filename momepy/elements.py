@@ -217,11 +217,10 @@ class Tessellation:
         changes = {}
         qid = 0
 
-        for ix, row in tqdm(tessellation.iterrows(), total=tessellation.shape[0]):
+        for cell in tqdm(tessellation.geometry, total=tessellation.shape[0]):
             corners = []
             change = []
 
-            cell = row.geometry
             coords = cell.exterior.coords
             for i in coords:
                 point = Point(i)
@@ -252,8 +251,9 @@ class Tessellation:
                     changes[(points[1].x, points[1].y)] = new
                     qid = qid + 1
 
-        for ix, row in tqdm(tessellation.iterrows(), total=tessellation.shape[0]):
-            cell = row.geometry
+        for ix, cell in tqdm(
+            tessellation.geometry.iteritems(), total=tessellation.shape[0]
+        ):
             coords = list(cell.exterior.coords)
 
             moves = {}
@@ -335,11 +335,13 @@ class Tessellation:
         """
         points = []
         ids = []
-        for idx, row in tqdm(objects.iterrows(), total=objects.shape[0]):
-            if row["geometry"].type in ["Polygon", "MultiPolygon"]:
-                poly_ext = row["geometry"].boundary
+        for geom, uid in tqdm(
+            zip(objects.geometry, objects[unique_id]), total=objects.shape[0]
+        ):
+            if geom.type in ["Polygon", "MultiPolygon"]:
+                poly_ext = geom.boundary
             else:
-                poly_ext = row["geometry"]
+                poly_ext = geom
             if poly_ext is not None:
                 if poly_ext.type == "MultiLineString":
                     for line in poly_ext:
@@ -347,13 +349,13 @@ class Tessellation:
                         row_array = np.array(point_coords[:-1]).tolist()
                         for i, a in enumerate(row_array):
                             points.append(row_array[i])
-                            ids.append(row[unique_id])
+                            ids.append(uid)
                 elif poly_ext.type == "LineString":
                     point_coords = poly_ext.coords
                     row_array = np.array(point_coords[:-1]).tolist()
                     for i, a in enumerate(row_array):
                         points.append(row_array[i])
-                        ids.append(row[unique_id])
+                        ids.append(uid)
                 else:
                     raise Exception("Boundary type is {}".format(poly_ext.type))
         return points, ids
@@ -8,6 +8,7 @@ import collections
 
 import numpy as np
 import pandas as pd
+from shapely.ops import unary_union
 from tqdm import tqdm  # progress bar
 
 __all__ = [
@@ -50,6 +51,9 @@ class AreaRatio:
         the name of the left dataframe column, ``np.array``, or ``pd.Series`` where is stored shared unique ID
     right_unique_id : str, list, np.array, pd.Series (default None)
         the name of the left dataframe column, ``np.array``, or ``pd.Series`` where is stored shared unique ID
+    dtype : numpy dtype (default np.float64)
+        data type of resulting values. Use ``np.float32`` to halve memory
+        if the full precision is not needed.
 
     Attributes
     ----------
@@ -82,6 +86,7 @@ class AreaRatio:
         unique_id=None,
         left_unique_id=None,
         right_unique_id=None,
+        dtype=np.float64,
     ):
         self.left = left
         self.right = right
@@ -110,17 +115,14 @@ class AreaRatio:
             right_areas = "mm_a"
         self.right_areas = right[right_areas]
 
-        look_for = right[
-            [right_unique_id, right_areas]
-        ].copy()  # keeping only necessary columns
-        look_for.rename(index=str, columns={right_areas: "lf_area"}, inplace=True)
-        look_for = look_for.groupby(right_unique_id).sum().reset_index()
-        objects_merged = left[[left_unique_id, left_areas]].merge(
-            look_for, left_on=left_unique_id, right_on=right_unique_id, how="left"
-        )
-        objects_merged.index = left.index
+        # sum of right areas for each id, aligned to the rows of left
+        look_for = right[right_areas].groupby(right[right_unique_id]).sum()
+        covering = look_for.reindex(left[left_unique_id].values).values
+
+        covering = covering.astype(dtype, copy=False)
+        covered = left[left_areas].values.astype(dtype, copy=False)
 
-        self.series = objects_merged["lf_area"] / objects_merged[left_areas]
+        self.series = pd.Series(covering / covered, index=left.index)
 
 
 class Count:
@@ -178,20 +180,27 @@ class Count:
         self.right_id = right[right_id]
         self.weighted = weighted
 
-        count = collections.Counter(right[right_id])
-        df = pd.DataFrame.from_dict(count, orient="index", columns=["mm_count"])
-        joined = left[[left_id, "geometry"]].join(df["mm_count"], on=left_id)
-        joined.loc[joined["mm_count"].isna(), "mm_count"] = 0
+        count = (
+            right[right_id]
+            .value_counts()
+            .reindex(left[left_id].values, fill_value=0)
+            .values
+        )
 
         if weighted:
-            if left.geometry[0].type in ["Polygon", "MultiPolygon"]:
-                joined["mm_count"] = joined["mm_count"] / left.geometry.area
-            elif left.geometry[0].type in ["LineString", "MultiLineString"]:
-                joined["mm_count"] = joined["mm_count"] / left.geometry.length
-            else:
+            geom_type = left.geom_type.values
+            polygonal = np.isin(geom_type, ["Polygon", "MultiPolygon"])
+            linear = np.isin(geom_type, ["LineString", "MultiLineString"])
+            # missing geometries have no type and result in NaN
+            valid = left.geometry.notna().values
+            if not (polygonal | linear)[valid].all():
                 raise TypeError("Geometry type does not support weighting.")
+            # divide by area or length based on the type of each geometry
+            count = count / np.where(
+                polygonal, left.geometry.area.values, left.geometry.length.values
+            )
 
-        self.series = joined["mm_count"]
+        self.series = pd.Series(count, index=left.index)
 
 
 class Courtyards:
@@ -231,7 +240,6 @@ class Courtyards:
     def __init__(self, gdf, block_id, spatial_weights=None):
         self.gdf = gdf
 
-        results_list = []
         gdf = gdf.copy()
 
         if not isinstance(block_id, str):
@@ -247,31 +255,25 @@ class Courtyards:
             spatial_weights = Queen.from_dataframe(gdf, silence_warnings=True)
 
         self.sw = spatial_weights
-        # dict to store nr of courtyards for each uID
-        courtyards = {}
         components = pd.Series(spatial_weights.component_labels, index=gdf.index)
-        for index in tqdm(gdf.index, total=gdf.shape[0]):
-            # if the id is already present in courtyards, continue (avoid repetition)
-            if index in courtyards:
-                continue
-            else:
-                comp = spatial_weights.component_labels[index]
-                to_join = components[components == comp].index
-                joined = gdf.loc[to_join]
-                dissolved = joined.geometry.buffer(
-                    0.01
-                ).unary_union  # buffer to avoid multipolygons where buildings touch by corners only
-                try:
-                    interiors = len(list(dissolved.interiors))
-                except (ValueError):
-                    print("Something unexpected happened.")
-                for b in to_join:
-                    courtyards[b] = interiors  # fill dict with values
-        # copy values from dict to gdf
-        for index, row in tqdm(gdf.iterrows(), total=gdf.shape[0]):
-            results_list.append(courtyards[index])
-
-        self.series = pd.Series(results_list, index=gdf.index)
+        groups = components.groupby(components).indices
+
+        # buffer to avoid multipolygons where buildings touch by corners only,
+        # mitred joins keep the number of vertices entering the union unchanged
+        geoms = gdf.geometry.buffer(0.01, join_style=2).values
+
+        # nr of courtyards for each component, each is dissolved only once
+        # (standalone buildings need no union)
+        courtyards = {
+            comp: _count_interiors(
+                geoms[positions[0]]
+                if len(positions) == 1
+                else unary_union(geoms[positions])
+            )
+            for comp, positions in tqdm(groups.items(), total=len(groups))
+        }
+
+        self.series = components.map(courtyards)
 
 
 class BlocksCount:
@@ -296,6 +298,9 @@ class BlocksCount:
         name of the column with unique id used as ``spatial_weights`` index
     weigted : bool, default True
         return value weighted by the analysed area (``True``) or pure count (``False``)
+    dtype : numpy dtype (default np.float64)
+        data type of resulting values. Use ``np.float32`` to halve memory
+        if the full precision is not needed.
 
     Attributes
     ----------
@@ -318,15 +323,18 @@ class BlocksCount:
     >>> tessellation_df['blocks_within_4'] = mm.BlocksCount(tessellation_df, 'bID', sw4, 'uID').series
     """
 
-    def __init__(self, gdf, block_id, spatial_weights, unique_id, weighted=True):
+    def __init__(
+        self, gdf, block_id, spatial_weights, unique_id, weighted=True, dtype=np.float64
+    ):
 
         self.gdf = gdf
         self.sw = spatial_weights
         self.id = gdf[unique_id]
         self.weighted = weighted
 
-        # define empty list for results
-        results_list = []
+        if weighted is not True and weighted is not False:
+            raise ValueError("Attribute 'weighted' needs to be True or False.")
+
         data = gdf.copy()
         if not isinstance(block_id, str):
             data["mm_bid"] = block_id
@@ -334,29 +342,21 @@ class BlocksCount:
         self.block_id = data[block_id]
         data = data.set_index(unique_id)
 
+        blocks = data[block_id].values
+        position = {uid: i for i, uid in enumerate(data.index)}
+        indptr, indices, in_sw = _neighbours_csr(data.index, spatial_weights, position)
+
+        counts = _reduce_neighbours(indptr, indices, blocks, "nunique").astype(dtype)
+        results = np.full(len(data), np.nan, dtype=dtype)
         if weighted is True:
-            areas = data.geometry.area
-
-        for index in tqdm(data.index, total=data.shape[0]):
-            if index in spatial_weights.neighbors.keys():
-                neighbours = spatial_weights.neighbors[index].copy()
-                neighbours.append(index)
-
-                vicinity = data.loc[neighbours]
-
-                if weighted is True:
-                    results_list.append(
-                        vicinity[block_id].unique().shape[0]
-                        / sum(areas.loc[neighbours])
-                    )
-                elif weighted is False:
-                    results_list.append(vicinity[block_id].unique().shape[0])
-                else:
-                    raise ValueError("Attribute 'weighted' needs to be True or False.")
-            else:
-                results_list.append(np.nan)
+            areas = _reduce_neighbours(
+                indptr, indices, data.geometry.area.values, "sum"
+            ).astype(dtype, copy=False)
+            results[in_sw] = counts[in_sw] / areas[in_sw]
+        else:
+            results[in_sw] = counts[in_sw]
 
-        self.series = pd.Series(results_list, index=gdf.index)
+        self.series = pd.Series(results, index=gdf.index)
 
 
 class Reached:
@@ -397,7 +397,8 @@ class Reached:
     Attributes
     ----------
     series : Series
-        Series containing resulting values
+        Series containing resulting values. Rows missing in ``spatial_weights``
+        are ``np.nan``.
     left : GeoDataFrame
         original left GeoDataFrame
     right : GeoDataFrame
@@ -434,8 +435,8 @@ class Reached:
         self.sw = spatial_weights
         self.mode = mode
 
-        # define empty list for results
-        results_list = []
+        if mode not in ["count", "sum", "mean", "std"]:
+            raise ValueError("Mode {} is not supported.".format(mode))
 
         if not isinstance(right_id, str):
             right = right.copy()
@@ -447,51 +448,48 @@ class Reached:
             left["mm_lid"] = left_id
             left_id = "mm_lid"
         self.left_id = left[left_id]
-        if mode == "count":
-            count = collections.Counter(right[right_id])
+        left_ids = left[left_id].values
+        if spatial_weights is None:
+            # each row reaches only itself
+            indptr = np.arange(len(left) + 1)
+            indices = np.arange(len(left))
+            in_sw = np.ones(len(left), dtype=bool)
+        else:
+            indptr, indices, in_sw = _neighbours_csr(left.index, spatial_weights)
 
-        # iterating over rows one by one
-        for index, lid in tqdm(left[left_id].iteritems(), total=left.shape[0]):
-            if spatial_weights is None:
-                ids = [lid]
+        if mode == "count":
+            # number of right elements per left row, summed over neighbours
+            count = right[right_id].value_counts().reindex(left_ids, fill_value=0)
+            counts = _reduce_neighbours(indptr, indices, count.values, "sum")
+            results = np.where(in_sw, counts, np.nan)
+        else:
+            if values:
+                vals = right[values]
             else:
-                neighbours = list(spatial_weights.neighbors[index])
-                neighbours.append(index)
-                ids = left.iloc[neighbours][left_id]
-            if mode == "count":
-                counts = []
-                for nid in ids:
-                    counts.append(count[nid])
-                results_list.append(sum(counts))
-            elif mode == "sum":
-                if values:
-                    results_list.append(
-                        sum(right.loc[right[right_id].isin(ids)][values])
-                    )
-                else:
-                    results_list.append(
-                        sum(right.loc[right[right_id].isin(ids)].geometry.area)
-                    )
-            elif mode == "mean":
-                if values:
-                    results_list.append(
-                        np.nanmean(right.loc[right[right_id].isin(ids)][values])
-                    )
-                else:
-                    results_list.append(
-                        np.nanmean(right.loc[right[right_id].isin(ids)].geometry.area)
-                    )
-            elif mode == "std":
-                if values:
-                    results_list.append(
-                        np.nanstd(right.loc[right[right_id].isin(ids)][values])
-                    )
-                else:
-                    results_list.append(
-                        np.nanstd(right.loc[right[right_id].isin(ids)].geometry.area)
-                    )
-
-        self.series = pd.Series(results_list, index=left.index)
+                vals = right.geometry.area
+            # map each id to the array of its values once
+            grouped = {
+                key: group.values for key, group in vals.groupby(right[right_id])
+            }
+            empty = np.array([], dtype=float)
+
+            results = np.full(len(left), np.nan)
+            # iterating over rows one by one
+            for i in tqdm(range(len(left)), total=left.shape[0]):
+                if not in_sw[i]:
+                    continue
+
+                ids = left_ids[indices[indptr[i] : indptr[i + 1]]]
+                arrays = [grouped[nid] for nid in dict.fromkeys(ids) if nid in grouped]
+                reached = np.concatenate(arrays) if arrays else empty
+                if mode == "sum":
+                    results[i] = reached.sum()
+                elif mode == "mean":
+                    results[i] = np.nanmean(reached)
+                elif mode == "std":
+                    results[i] = np.nanstd(reached)
+
+        self.series = pd.Series(results, index=left.index)
 
 
 class NodeDensity:
@@ -523,7 +521,8 @@ class NodeDensity:
     Attributes
     ----------
     series : Series
-        Series containing resulting values
+        Series containing resulting values. Rows missing in ``spatial_weights``
+        are ``np.nan``.
     left : GeoDataFrame
         original left GeoDataFrame
     right : GeoDataFrame
@@ -563,33 +562,41 @@ class NodeDensity:
             self.node_degree = left[node_degree]
         self.node_start = right[node_start]
         self.node_end = right[node_end]
-        # define empty list for results
-        results_list = []
 
-        lengths = right.geometry.length
+        # lengths and ids of edges are computed once and reused for every node
+        lengths = right.geometry.length.values
+        ends = right[node_end].values
+        # positions of edges indexed by their starting node
+        edges_from = collections.defaultdict(list)
+        for position, start in enumerate(right[node_start].values):
+            edges_from[start].append(position)
+        indptr, indices, in_sw = _neighbours_csr(left.index, spatial_weights)
+        if weighted:
+            number_nodes = _reduce_neighbours(
+                indptr, indices, left[node_degree].values - 1, "sum"
+            )
+        else:
+            number_nodes = _reduce_neighbours(indptr, indices, None, "count")
 
+        results = np.full(len(left), np.nan)
         # iterating over rows one by one
-        for index in tqdm(left.index, total=left.shape[0]):
-
-            neighbours = list(spatial_weights.neighbors[index])
-            neighbours.append(index)
-            if weighted:
-                neighbour_nodes = left.iloc[neighbours]
-                number_nodes = sum(neighbour_nodes[node_degree] - 1)
-            else:
-                number_nodes = len(neighbours)
+        for i in tqdm(range(len(left)), total=left.shape[0]):
+            if not in_sw[i]:
+                continue
 
-            length = lengths.loc[
-                right["node_start"].isin(neighbours)
-                & right["node_end"].isin(neighbours)
-            ].sum()
+            # edges with both start and end within neighbours
+            neighbours = set(indices[indptr[i] : indptr[i + 1]])
+            edges = [
+                e for n in neighbours for e in edges_from[n] if ends[e] in neighbours
+            ]
+            length = lengths[np.sort(np.array(edges, dtype=np.int64))].sum()
 
             if length > 0:
-                results_list.append(number_nodes / length)
+                results[i] = number_nodes[i] / length
             else:
-                results_list.append(0)
+                results[i] = 0
 
-        self.series = pd.Series(results_list, index=left.index)
+        self.series = pd.Series(results, index=left.index)
 
 
 class Density:
@@ -614,6 +621,9 @@ class Density:
     areas :  str, list, np.array, pd.Series (optional)
         the name of the dataframe column, ``np.array``, or ``pd.Series`` where is stored area value. If None,
         gdf.geometry.area will be used.
+    dtype : numpy dtype (default np.float64)
+        data type of resulting values. Use ``np.float32`` to halve memory
+        if the full precision is not needed.
 
     Attributes
     ----------
@@ -635,13 +645,13 @@ class Density:
     >>> tessellation_df['floor_area_dens'] = mm.Density(tessellation_df, 'floor_area', sw, 'uID').series
     """
 
-    def __init__(self, gdf, values, spatial_weights, unique_id, areas=None):
+    def __init__(
+        self, gdf, values, spatial_weights, unique_id, areas=None, dtype=np.float64
+    ):
         self.gdf = gdf
         self.sw = spatial_weights
         self.id = gdf[unique_id]
 
-        # define empty list for results
-        results_list = []
         data = gdf.copy()
 
         if values is not None:
@@ -659,20 +669,109 @@ class Density:
         self.areas = data[areas]
 
         data = data.set_index(unique_id)
-        # iterating over rows one by one
-        for index in tqdm(data.index, total=data.shape[0]):
-            if index in spatial_weights.neighbors.keys():
-                neighbours = spatial_weights.neighbors[index].copy()
-                if neighbours:
-                    neighbours.append(index)
-                else:
-                    neighbours = index
-                subset = data.loc[neighbours]
-                values_list = subset[values]
-                areas_list = subset[areas]
-
-                results_list.append(np.sum(values_list) / np.sum(areas_list))
-            else:
-                results_list.append(np.nan)
+        position = {uid: i for i, uid in enumerate(data.index)}
+        indptr, indices, in_sw = _neighbours_csr(data.index, spatial_weights, position)
+
+        # gather values and areas of neighbours together (missing values are skipped)
+        # and sum them over contiguous segments, each row present in
+        # spatial_weights has at least one item (itself)
+        gathered = data[[values, areas]].fillna(0).values.astype(float)[indices]
+        results = np.full(len(data), np.nan, dtype=dtype)
+        if in_sw.any():
+            sums = np.add.reduceat(gathered, indptr[:-1][in_sw], axis=0)
+            sums = sums.astype(dtype, copy=False)
+            results[in_sw] = sums[:, 0] / sums[:, 1]
+
+        self.series = pd.Series(results, index=gdf.index)
+
 
-        self.series = pd.Series(results_list, index=gdf.index)
+def _count_interiors(geom):
+    """
+    Count interior rings of a Polygon or of all parts of a MultiPolygon.
+    """
+    if geom.type == "Polygon":
+        return len(geom.interiors)
+    return sum(len(part.interiors) for part in geom.geoms)
+
+
+def _neighbours_csr(ids, spatial_weights, position=None):
+    """
+    Flatten neighbours of each id, followed by the id itself, into CSR-like arrays.
+
+    Parameters
+    ----------
+    ids : iterable
+        ids used as keys of ``spatial_weights``, in the order of rows
+    spatial_weights : libpysal.weights
+        spatial weights matrix
+    position : dict (default None)
+        mapping of ids to row positions. If None, ids are used as positions.
+
+    Returns
+    -------
+    indptr : np.array
+        positions of neighbours of i-th row are ``indices[indptr[i]:indptr[i + 1]]``
+    indices : np.array
+        row positions of neighbours
+    in_sw : np.array
+        boolean mask of rows present in ``spatial_weights``
+    """
+    keys = set(spatial_weights.neighbors.keys())
+    in_sw = np.zeros(len(ids), dtype=bool)
+    counts = np.zeros(len(ids), dtype=np.int64)
+    flat = []
+    for i, index in enumerate(ids):
+        if index in keys:
+            neighbours = spatial_weights.neighbors[index]
+            flat.extend(neighbours)
+            flat.append(index)
+            counts[i] = len(neighbours) + 1
+            in_sw[i] = True
+
+    if position is None:
+        indices = np.array(flat, dtype=np.int32)
+    else:
+        indices = np.fromiter(
+            (position[n] for n in flat), dtype=np.int32, count=len(flat)
+        )
+    indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+
+    return indptr, indices, in_sw
+
+
+def _reduce_neighbours(indptr, indices, values, how):
+    """
+    Reduce ``values`` of neighbours stored in CSR-like arrays for each row.
+
+    Parameters
+    ----------
+    indptr, indices : np.array
+        neighbours as returned by :func:`_neighbours_csr`
+    values : np.array
+        values indexed by row position
+    how : str
+        ``'sum'``, ``'nunique'`` or ``'count'``
+
+    Returns
+    -------
+    np.array
+        reduced value for each row (``0`` for rows without neighbours)
+    """
+    n = len(indptr) - 1
+    if how == "count":
+        return np.diff(indptr)
+
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    if how == "sum":
+        # bincount accumulates sequentially, in the order of neighbours
+        return np.bincount(rows, weights=values[indices], minlength=n)
+    if how == "nunique":
+        # encode values as integers (missing values get their own code 0) and
+        # count unique (row, code) pairs combined into a single integer key
+        codes = pd.factorize(values)[0][indices] + 1
+        width = codes.max() + 1 if len(codes) else 1
+        pairs = np.unique(rows * width + codes)
+        return np.bincount(pairs // width, minlength=n)
+
+    raise ValueError("'{}' is not supported.".format(how))
@@ -3,7 +3,10 @@ import momepy as mm
 import numpy as np
 import pytest
 from libpysal.weights import Queen
+from momepy.intensity import _count_interiors
 from pytest import approx
+from shapely.affinity import translate
+from shapely.geometry import LineString, MultiPolygon, Point, Polygon
 
 
 class TestIntensity:
@@ -77,6 +80,16 @@ class TestIntensity:
         self.blocks["area"] = self.blocks.geometry.area
         car_block = mm.AreaRatio(self.blocks, self.df_buildings, "area", "area", "bID")
         assert car_block.series.mean() == 0.2761974319698012
+        car32 = mm.AreaRatio(
+            self.df_tessellation,
+            self.df_buildings,
+            "area",
+            "area",
+            "uID",
+            dtype=np.float32,
+        ).series
+        assert car32.dtype == np.float32
+        assert car32.mean() == approx(0.3206556897709747)
 
     def test_Count(self):
         eib = mm.Count(self.blocks, self.df_buildings, "bID", "bID").series
@@ -91,6 +104,28 @@ class TestIntensity:
         assert eib.tolist() == check_eib
         assert weib.mean() == check_weib
         assert weis.mean() == 0.020524232642849215
+        points = self.blocks.copy()
+        points["geometry"] = points.centroid
+        with pytest.raises(TypeError):
+            mm.Count(points, self.df_buildings, "bID", "bID", weighted=True)
+        mixed = gpd.GeoDataFrame(
+            {
+                "mID": [1, 2, 3],
+                "geometry": [
+                    Polygon([(0, 0), (0, 2), (2, 2), (2, 0)]),
+                    LineString([(0, 0), (4, 0)]),
+                    None,
+                ],
+            },
+            index=[5, 6, 7],
+        )
+        objects = gpd.GeoDataFrame(
+            {"mID": [1, 1, 2], "geometry": [Point(0, 0), Point(1, 1), Point(2, 0)]}
+        )
+        weighted_mixed = mm.Count(mixed, objects, "mID", "mID", weighted=True).series
+        assert weighted_mixed.index.tolist() == [5, 6, 7]
+        assert weighted_mixed.iloc[:2].tolist() == [0.5, 0.25]
+        assert np.isnan(weighted_mixed.iloc[2])
 
     def test_Courtyards(self):
         courtyards = mm.Courtyards(self.df_buildings, "bID").series
@@ -102,6 +137,14 @@ class TestIntensity:
         assert courtyards.mean() == check
         assert courtyards_wm.mean() == check
 
+        ring = Polygon(
+            [(0, 0), (0, 10), (10, 10), (10, 0)], [[(4, 4), (4, 6), (6, 6), (6, 4)]]
+        )
+        square = Polygon([(20, 0), (20, 5), (25, 5), (25, 0)])
+        assert _count_interiors(ring) == 1
+        assert _count_interiors(MultiPolygon([ring, square])) == 1
+        assert _count_interiors(MultiPolygon([ring, translate(ring, xoff=20)])) == 2
+
     def test_BlocksCount(self):
         sw = mm.sw_high(k=5, gdf=self.df_tessellation, ids="uID")
         count = mm.BlocksCount(self.df_tessellation, "bID", sw, "uID").series
@@ -116,10 +159,17 @@ class TestIntensity:
         assert count.mean() == check
         assert count2.mean() == check
         assert unweigthed.mean() == check2
+        count32 = mm.BlocksCount(
+            self.df_tessellation, "bID", sw, "uID", dtype=np.float32
+        ).series
+        assert count32.dtype == np.float32
+        assert count32.mean() == approx(check)
         with pytest.raises(ValueError):
             count = mm.BlocksCount(
                 self.df_tessellation, "bID", sw, "uID", weighted="yes"
             )
+        with pytest.raises(ValueError):
+            count = mm.BlocksCount(self.df_tessellation, "bID", sw, "uID", weighted=1)
         sw_drop = mm.sw_high(k=5, gdf=self.df_tessellation[2:], ids="uID")
         assert (
             mm.BlocksCount(self.df_tessellation, "bID", sw_drop, "uID")
@@ -171,13 +221,22 @@ class TestIntensity:
             self.df_streets, self.df_buildings, "nID", "nID", sw
         ).series
         assert max(count) == 18
-        assert max(area) == 18085.45897711331
+        assert max(area) == approx(18085.45897711331)
         assert max(count_sw) == 138
         assert max(mean) == 1808.5458977113315
         assert max(std) == 3153.7019229524785
-        assert max(area_v) == 79169.31385861784
+        assert max(area_v) == approx(79169.31385861784)
         assert max(mean_v) == 7916.931385861784
         assert max(std_v) == 8995.18003493457
+        sw_drop = mm.sw_high(k=2, gdf=self.df_streets)
+        del sw_drop.neighbors[0]
+        assert (
+            mm.Reached(self.df_streets, self.df_buildings, "nID", "nID", sw_drop)
+            .series.isna()
+            .any()
+        )
+        with pytest.raises(ValueError):
+            mm.Reached(self.df_streets, self.df_buildings, "nID", "nID", mode="max")
 
     def test_NodeDensity(self):
         nx = mm.gdf_to_nx(self.df_streets)
@@ -192,6 +251,14 @@ class TestIntensity:
         assert density.mean() == 0.012690163074599968
         assert weighted.mean() == 0.023207675994368446
         assert array.mean() == 0.008554067995928158
+        renamed = edges.rename(columns={"node_start": "start", "node_end": "end"})
+        custom = mm.NodeDensity(
+            nodes, renamed, sw, node_start="start", node_end="end"
+        ).series
+        assert custom.equals(density)
+        sw_drop = mm.sw_high(k=3, weights=W)
+        del sw_drop.neighbors[0]
+        assert mm.NodeDensity(nodes, edges, sw_drop).series.isna().any()
 
     def test_Density(self):
         sw = mm.sw_high(k=3, gdf=self.df_tessellation, ids="uID")
@@ -208,6 +275,15 @@ class TestIntensity:
         check = 1.661587
         assert dens.mean() == approx(check)
         assert dens2.mean() == approx(check)
+        dens32 = mm.Density(
+            self.df_tessellation,
+            self.df_buildings["fl_area"],
+            sw,
+            "uID",
+            dtype=np.float32,
+        ).series
+        assert dens32.dtype == np.float32
+        assert dens32.mean() == approx(check)
         sw_drop = mm.sw_high(k=3, gdf=self.df_tessellation[2:], ids="uID")
         assert (
             mm.Density(